@@ -5,6 +5,7 @@ A user-friendly web app for translating PDFs between English and Spanish.
 
 import streamlit as st
 import tempfile
+import hashlib
 import os
 from pathlib import Path
 from translator import PDFTranslator
@@ -16,6 +17,24 @@ st.set_page_config(
     layout="centered"
 )
 
+
+# Cached resources
+@st.cache_resource
+def get_translator():
+    """Create one translator (with its OpenAI clients and event loop) shared across reruns and sessions."""
+    return PDFTranslator()
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def extract_blocks_cached(file_hash, _path):
+    """Extract text blocks once per PDF content hash.
+
+    The leading underscore keeps the temp file path out of the cache key.
+    Entries expire after an hour so the cache can't grow without bound.
+    """
+    return get_translator().extract_blocks(_path)
+
+
 # Custom CSS for better styling
 st.markdown("""
     <style>
@@ -60,6 +79,11 @@ with st.sidebar:
 
     st.header("Settings")
     show_cost = st.checkbox("Show estimated cost", value=False)
+    batch_mode = st.checkbox(
+        "Batch mode (cheaper, slower)",
+        value=False,
+        help="Uses the OpenAI Batch API at ~50% lower cost. Jobs can take up to 24 hours."
+    )
 
     st.markdown("---")
     st.caption("Built with Python, OpenAI API, and Streamlit")
@@ -102,6 +126,9 @@ if uploaded_file:
     if show_cost:
         # Rough estimation: ~$0.01 per MB
         estimated_cost = file_size * 0.01
+        if batch_mode:
+            # Batch API requests are billed at half price
+            estimated_cost *= 0.5
         st.caption(f"💰 Estimated cost: ${estimated_cost:.3f}")
 
     # Translate button
@@ -113,52 +140,83 @@ if uploaded_file:
                 st.error("❌ OpenAI API key not found! Please set OPENAI_API_KEY environment variable.")
                 st.stop()
 
-            # Create temporary files
+            # Create temporary files, hashing the upload in the same pass
+            hasher = hashlib.sha256()
             with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_input:
-                tmp_input.write(uploaded_file.read())
+                # Stream in 1MB blocks; the buffer position persists across reruns
+                uploaded_file.seek(0)
+                while block := uploaded_file.read(1024 * 1024):
+                    tmp_input.write(block)
+                    hasher.update(block)
                 input_path = tmp_input.name
-
-            output_path = tempfile.mktemp(suffix='.pdf')
+            file_hash = hasher.hexdigest()
 
             # Progress tracking
             progress_bar = st.progress(0)
             status_text = st.empty()
 
-            # Initialize translator
-            status_text.text("Initializing translator...")
-            progress_bar.progress(10)
-            translator = PDFTranslator()
-
-            # Extract text
-            status_text.text("📄 Extracting text from PDF...")
-            progress_bar.progress(25)
-            text = translator.extract_text(input_path)
-
-            # Show extraction info
-            char_count = len(text)
-            status_text.text(f"✓ Extracted {char_count:,} characters")
-            progress_bar.progress(40)
-
-            # Translate
-            status_text.text(f"🌐 Translating to {target_lang}...")
-            progress_bar.progress(50)
-            translated_text = translator.translate_text(text, target_lang)
-            progress_bar.progress(85)
-
-            # Create PDF
-            status_text.text("📝 Creating translated PDF...")
-            translator.create_pdf(translated_text, output_path)
-            progress_bar.progress(100)
-
-            status_text.text("✅ Translation complete!")
+            # Reuse a translation of this exact file from earlier in the session
+            translations = st.session_state.setdefault("translations", {})
+            translation_key = (file_hash, target_lang)
+
+            if translation_key in translations:
+                translated_text, pdf_bytes = translations[translation_key]
+                progress_bar.progress(100)
+                status_text.text("✅ Loaded translation from earlier in this session")
+            else:
+                # Initialize translator
+                status_text.text("Initializing translator...")
+                progress_bar.progress(10)
+                translator = get_translator()
+
+                # Extract text (cached by file content, so re-translating skips this)
+                status_text.text("📄 Extracting text from PDF...")
+                progress_bar.progress(25)
+                blocks = extract_blocks_cached(file_hash, input_path)
+
+                # Show extraction info
+                char_count = sum(len(block) for block in blocks)
+                status_text.text(f"✓ Extracted {char_count:,} characters")
+                progress_bar.progress(40)
+
+                # Translate
+                if batch_mode:
+                    status_text.text(f"🌐 Translating to {target_lang} (batch job, this may take a while)...")
+                    progress_bar.progress(50)
+                    translated_text = translator.translate_text(blocks, target_lang, batch=True)
+                else:
+                    status_text.text(f"🌐 Translating to {target_lang}...")
+                    translated_chunks = {}
+
+                    # Advance the bar from 40% to 85% as chunks actually finish
+                    with st.status(f"Translating to {target_lang}...", expanded=True) as translate_status:
+                        chunk_updates = translator.iter_translate_text(blocks, target_lang)
+                        for done, (i, total, translated_chunk) in enumerate(chunk_updates, 1):
+                            translated_chunks[i] = translated_chunk
+                            translate_status.write(f"✓ Chunk {i}/{total} translated ({done}/{total} done)")
+                            progress_bar.progress(40 + int(45 * done / total))
+
+                        translate_status.update(label="Translation complete", state="complete", expanded=False)
+
+                    translated_text = '\n\n'.join(translated_chunks[i] for i in sorted(translated_chunks))
+                progress_bar.progress(85)
+
+                # Create PDF
+                status_text.text("📝 Creating translated PDF...")
+                pdf_bytes = translator.create_pdf(translated_text)
+                progress_bar.progress(100)
+
+                status_text.text("✅ Translation complete!")
+
+                # Keep only the few most recent results to bound session memory
+                translations[translation_key] = (translated_text, pdf_bytes)
+                if len(translations) > 4:
+                    translations.pop(next(iter(translations)))
 
             # Success message
             st.success("🎉 Translation completed successfully!")
 
             # Download button
-            with open(output_path, 'rb') as f:
-                pdf_bytes = f.read()
-
             original_name = Path(uploaded_file.name).stem
             download_name = f"{original_name}_{target_lang.lower()}.pdf"
 
@@ -182,7 +240,6 @@ if uploaded_file:
             # Cleanup
             try:
                 os.unlink(input_path)
-                os.unlink(output_path)
             except:
                 pass
 
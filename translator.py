@@ -1,15 +1,140 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
 import os
-from pypdf import PdfReader
+import tempfile
+import threading
+import time
+import httpx
+import tiktoken
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
 from fpdf import FPDF
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from dotenv import load_dotenv
 
+try:
+    import fitz  # PyMuPDF: C-based parser, much faster than pypdf
+    PdfReader = None
+except ImportError:
+    # Fall back to the slower pure-Python parser
+    fitz = None
+    from pypdf import PdfReader
+
 load_dotenv()
 
+# Connection settings for the OpenAI clients; HTTP/2 lets concurrent
+# chunk requests share a single connection instead of one each
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_HTTP_TIMEOUT = httpx.Timeout(300.0, connect=10.0)  # full-size chunks take a while to generate
+
+# Typographic characters the built-in PDF fonts can't render, using Unicode escapes
+_CLEAN_TABLE = str.maketrans({
+    '\u2018': "'",  # '
+    '\u2019': "'",  # '
+    '\u201c': '"',  # "
+    '\u201d': '"',  # "
+    '\u2014': '-',  # —
+    '\u2026': '...',  # …
+})
+
+
+def _count_pages(pdf_path):
+    """Return the number of pages in a PDF."""
+    if fitz:
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+
+    return len(PdfReader(pdf_path).pages)
+
+
+def _page_blocks(page):
+    """Return the text blocks (paragraphs) of a PyMuPDF page in reading order."""
+    # Each block is (x0, y0, x1, y1, text, block_no, block_type); type 0 is text
+    blocks = sorted((block for block in page.get_text("blocks") if block[6] == 0),
+                    key=lambda block: (block[5], block[1]))
+
+    # Line breaks inside a block are layout wrapping, not paragraph breaks
+    return [" ".join(block[4].split()) for block in blocks if block[4].strip()]
+
+
+def _iter_page_blocks(pdf_path, start, stop):
+    """Yield the list of text blocks for pages [start, stop), opening the PDF once."""
+    if fitz:
+        with fitz.open(pdf_path) as doc:
+            for i in range(start, stop):
+                yield _page_blocks(doc[i])
+    else:
+        reader = PdfReader(pdf_path)
+        for i in range(start, stop):
+            # pypdf has no layout info, so fall back to blank-line paragraphs
+            # (and it can return None for pages without a text layer)
+            page_text = reader.pages[i].extract_text() or ""
+            yield [block.strip() for block in page_text.split("\n\n") if block.strip()]
+
+
+def _extract_page_range(pdf_path, start, stop):
+    """Extract text blocks from pages [start, stop) of a PDF (runs in a worker process)."""
+    # Each worker opens its own document so no PDF objects are pickled
+    return list(_iter_page_blocks(pdf_path, start, stop))
+
+
+def _iter_pieces(text, separator):
+    """Yield the pieces of text between separators, lazily.
+
+    Each separator stays attached to the piece before it so no text is
+    lost, and no list of every piece in the document is built.
+    """
+    start = 0
+    while True:
+        end = text.find(separator, start)
+        if end == -1:
+            yield text[start:]
+            return
+
+        end += len(separator)
+        yield text[start:end]
+        start = end
+
+
+async def _anext(agen, default):
+    """Return the next item of an async generator, or default once it is exhausted."""
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return default
+
 
 class PDFTranslator:
     """A class that translates PDF documents."""
 
+    # Maximum size of a translation chunk, in tokens
+    chunk_tokens = 8000
+
+    # Maximum number of chunk requests in flight at once
+    max_concurrency = 12
+
+    # PDFs with fewer pages than this are extracted in-process
+    # (PyMuPDF is fast enough that only long documents benefit)
+    parallel_min_pages = 32 if fitz else 4
+
+    # Number of pages each worker process extracts per task
+    pages_per_task = 4
+
+    # Upper bound on extraction worker processes (also capped by CPU count)
+    max_extract_workers = 4
+
+    # Number of translations kept in memory (the disk cache is unbounded)
+    memory_cache_size = 1024
+
+    # Seconds between batch status checks (doubles up to batch_poll_max)
+    batch_poll_interval = 10
+    batch_poll_max = 300
+
     def __init__(self, api_key=None):
         """Initialize the PDFTranslator with an API key."""
 
@@ -21,138 +146,580 @@ class PDFTranslator:
             raise Exception('API key is not found. Set it in .env file.')
 
         # Creates OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(
+            api_key=self.api_key,
+            http_client=httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        )
         self.model = "gpt-4o-mini"
+        # Deterministic output so cached translations stay valid
+        self.temperature = 0
+        self.encoding = tiktoken.encoding_for_model(self.model)
+
+        # One event loop runs in a background thread for the translator's
+        # lifetime, so the async client (and its HTTP/2 connection) is reused
+        # across translations instead of being rebuilt for each one
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+            # Retries are handled by _create_completion's backoff, not the SDK
+            max_retries=0
+        )
+
+        # Translation cache: recent entries in memory, everything on disk
+        self._cache_dir = Path.home() / ".pdf_translator_cache"
+        self._memory_cache = OrderedDict()
+        # The translator may be shared between threads (e.g. Streamlit sessions)
+        self._cache_lock = threading.Lock()
+
         print("Translator Successfully Initialized.")
 
-    def extract_text(self, pdf_path):
-        """Extract text from PDF."""
-        print(f"Extracting text from PDF: {pdf_path}")
+    def iter_pages(self, pdf_path):
+        """Yield (page_num, blocks) for each page of a PDF, in order.
 
-        reader = PdfReader(pdf_path)
+        blocks is the page's list of text blocks (paragraphs), in reading order.
+        """
+        print(f"Extracting text from PDF: {pdf_path}")
 
-        text = ''
+        num_pages = _count_pages(pdf_path)
 
-        for page_num, page in enumerate(reader.pages, 1):
-            print(f" Reading page: {page_num}/{len(reader.pages)}")
+        # Small PDFs aren't worth the process startup cost
+        if num_pages < self.parallel_min_pages:
+            for page_num, blocks in enumerate(_iter_page_blocks(pdf_path, 0, num_pages), 1):
+                print(f" Reading page: {page_num}/{num_pages}")
+                yield page_num, blocks
+            return
 
-            page_text = page.extract_text()
+        print(f" Reading {num_pages} pages in parallel")
 
-            text += page_text + "\n\n"
+        # Workers only receive the path and a page range; map keeps page order
+        starts = range(0, num_pages, self.pages_per_task)
+        stops = [min(start + self.pages_per_task, num_pages) for start in starts]
 
-        return text.strip()
+        # Never fork: the translator runs an event loop thread, and Streamlit
+        # serves every session from threads of one process
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        workers = min(os.cpu_count() or 1, self.max_extract_workers, len(starts))
 
-    def translate_text(self, text, target_language):
-        """Translate text using OpenAI API."""
-        print(f"🌐 Translating to {target_language}...")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as executor:
+            page_ranges = executor.map(_extract_page_range, repeat(pdf_path), starts, stops)
+            for start, page_range in zip(starts, page_ranges):
+                for page_num, blocks in enumerate(page_range, start + 1):
+                    yield page_num, blocks
 
-        # Split text into chunks
-        words = text.split()
-        chunk_size = 15000  # characters instead of words
-        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    def extract_blocks(self, pdf_path):
+        """Extract the text blocks (paragraphs) of a PDF as a list of strings."""
+        return [block for _, blocks in self.iter_pages(pdf_path) for block in blocks]
 
-        for i in range(0, len(words), chunk_size):
-            chunk = ' '.join(words[i:i + chunk_size])
-            chunks.append(chunk)
+    def extract_text(self, pdf_path):
+        """Extract text from PDF."""
+        return "\n\n".join(self.extract_blocks(pdf_path))
+
+    def translate_text(self, text, target_language, batch=False):
+        """Translate text using OpenAI API.
+
+        text may be a string or a list of text blocks (see extract_blocks);
+        blocks are packed into chunks without being split.
+
+        With batch=True the chunks are sent through the Batch API, which
+        costs less but may take up to 24 hours to complete.
+        """
+        if batch:
+            chunks = self._prepare_chunks(text, target_language)
+            translated_chunks = self.translate_text_batch(chunks, target_language)
+        else:
+            # Chunks finish in any order; sort them back by position
+            finished = {i: translated_chunk for i, _, translated_chunk
+                        in self.iter_translate_text(text, target_language)}
+            translated_chunks = [finished[i] for i in sorted(finished)]
 
-        print(f"  ➤ Split into {len(chunks)} chunk(s)")
+        # Combine chunks in order
+        full_translation = '\n\n'.join(translated_chunks)
+        print("✓ Translation complete!")
 
-        # Translate each chunk WITH NUMBERING for order preservation
-        translated_chunks = []
-        for i, chunk in enumerate(chunks, 1):
-            print(f"  ➤ Translating chunk {i}/{len(chunks)}")
+        return full_translation
 
-            # Add chunk number to help preserve order
-            prompt = f"Translate the following text to {target_language}. This is part {i} of {len(chunks)}. Maintain the original formatting and do NOT add any introductory text:\n\n{chunk}"
+    def iter_translate_text(self, text, target_language):
+        """Translate text, yielding (i, total, translated_chunk) as each chunk finishes.
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system",
-                     "content": f"You are a professional translator. Translate text accurately to {target_language}. Output ONLY the translation, no explanations or notes."
-                     },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
+        Chunks arrive in completion order, not document order; i is the
+        chunk's 1-based position, used to reassemble the translation.
+        text may be a string or a list of text blocks, as in translate_text.
+        """
+        chunks = self._prepare_chunks(text, target_language)
 
-            translated_text = response.choices[0].message.content
-            translated_chunks.append(translated_text)
+        yield from self._iter_async(self._translate_as_completed(chunks, target_language))
 
-            # Debug: Show preview of what was translated
-            print(f"      Preview: {translated_text[:50]}...")
+    def _prepare_chunks(self, text, target_language):
+        """Announce a translation and split its text into chunks."""
+        print(f"🌐 Translating to {target_language}...")
 
-        # Combine chunks in order
-        full_translation = '\n\n'.join(translated_chunks)
-        print("✓ Translation complete!")
+        chunks = self._chunk(text)
+        print(f"  ➤ Split into {len(chunks)} chunk(s)")
 
-        return full_translation
+        return chunks
+
+    def _count_tokens(self, text):
+        """Count tokens in text using the model's tokenizer."""
+        # Treat special-token markers in the document as plain text
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def _split_text(self, text, separators=("\n\n", ". ", "。", " ")):
+        """Split text into chunks of at most chunk_tokens tokens.
+
+        Greedily packs paragraphs into each chunk, breaking oversized
+        paragraphs on sentences and then words, so every request carries
+        as much text as the budget allows.
+        """
+        # Shortcut for text that may fit in one chunk. Long text skips it so
+        # the whole document is never encoded into one big token list;
+        # packing the pieces below gives the same result either way.
+        if len(text) <= 4 * self.chunk_tokens and self._count_tokens(text) <= self.chunk_tokens:
+            return [text.strip()] if text.strip() else []
+
+        if not separators:
+            # Nothing left to break on; cut at the token limit. Cuts are made
+            # in the original text at token start offsets, so a character
+            # split across tokens (common in CJK) is never cut in half
+            tokens = self.encoding.encode(text, disallowed_special=())
+            _, offsets = self.encoding.decode_with_offsets(tokens)
+            bounds = [0] + [offsets[i] for i in range(self.chunk_tokens, len(tokens), self.chunk_tokens)] + [len(text)]
+            pieces = (text[start:end].strip() for start, end in zip(bounds, bounds[1:]))
+            return [piece for piece in pieces if piece]
+
+        separator, finer_separators = separators[0], separators[1:]
+
+        chunks = []
+        current = []
+        current_tokens = 0
+
+        for piece in _iter_pieces(text, separator):
+            piece_tokens = self._count_tokens(piece)
+
+            if current and current_tokens + piece_tokens > self.chunk_tokens:
+                chunks.append(''.join(current).strip())
+                current = []
+                current_tokens = 0
+
+            if piece_tokens > self.chunk_tokens:
+                # Too big on its own; split it on a finer boundary
+                chunks.extend(self._split_text(piece, finer_separators))
+            else:
+                current.append(piece)
+                current_tokens += piece_tokens
+
+        if current:
+            chunks.append(''.join(current).strip())
+
+        return [chunk for chunk in chunks if chunk]
+
+    def _chunk(self, text):
+        """Split a string, or pack a list of text blocks, into translation chunks."""
+        if isinstance(text, str):
+            return self._split_text(text)
+
+        return list(self._pack_blocks(text))
+
+    def _pack_blocks(self, blocks):
+        """Pack text blocks into chunks of at most chunk_tokens tokens.
+
+        Blocks are never split unless one is over the budget on its own.
+        They're consumed lazily, so chunks are produced while later pages
+        are still being extracted.
+        """
+        buffer = []
+        buffer_tokens = 0
+        # Blocks are joined with a blank line, which counts against the budget too
+        separator_tokens = self._count_tokens("\n\n")
+
+        for block in blocks:
+            block_tokens = self._count_tokens(block)
+
+            if buffer and buffer_tokens + separator_tokens + block_tokens > self.chunk_tokens:
+                yield "\n\n".join(buffer)
+                buffer = []
+                buffer_tokens = 0
+
+            if block_tokens > self.chunk_tokens:
+                yield from self._split_text(block)
+            else:
+                if buffer:
+                    buffer_tokens += separator_tokens
+                buffer.append(block)
+                buffer_tokens += block_tokens
+
+        if buffer:
+            yield "\n\n".join(buffer)
+
+    def _build_messages(self, chunk, target_language):
+        """Build the chat messages for translating one chunk.
+
+        The prompt is kept short since it is re-sent with every chunk;
+        chunk order is tracked by index on our side, not by the model.
+        """
+        return [
+            {"role": "system", "content": f"Translate to {target_language}. Output only the translation."},
+            {"role": "user", "content": chunk}
+        ]
+
+    def translate_text_batch(self, chunks, target_language):
+        """Translate chunks with the OpenAI Batch API and return them in order.
+
+        Each successful result is cached as soon as it is read. Requests
+        that failed or never ran (e.g. the batch expired) are retried with
+        the regular concurrent requests.
+        """
+        keys = [self._cache_key(chunk, target_language) for chunk in chunks]
+        translations = [self._cache_get(key) for key in keys]
+
+        # Only chunks that aren't cached need to go through the batch job
+        missing = [i for i, translation in enumerate(translations, 1) if translation is None]
+        if not missing:
+            print("  ➤ All chunks found in cache")
+            return translations
+
+        print(f"  ➤ Submitting {len(missing)} chunk(s) as a batch job")
+
+        # One request per line; custom_id maps results back to chunks
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', encoding='utf-8', delete=False) as batch_file:
+            for i in missing:
+                chunk = chunks[i - 1]
+                request = {
+                    "custom_id": f"chunk-{i:06d}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": self._build_messages(chunk, target_language),
+                        "temperature": self.temperature
+                    }
+                }
+                batch_file.write(json.dumps(request) + "\n")
+            batch_path = batch_file.name
+
+        try:
+            with open(batch_path, 'rb') as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+        finally:
+            os.unlink(batch_path)
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"  ➤ Batch {batch.id} created, waiting for results...")
+
+        # Poll with exponential backoff until the job reaches a final state
+        delay = self.batch_poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(delay)
+            delay = min(delay * 2, self.batch_poll_max)
+            batch = self.client.batches.retrieve(batch.id)
+            # request_counts isn't filled in until the job starts running
+            counts = batch.request_counts
+            if counts:
+                print(f"      Status: {batch.status} ({counts.completed}/{counts.total})")
+            else:
+                print(f"      Status: {batch.status}")
+
+        if batch.status in ("failed", "cancelled"):
+            raise Exception(f"Batch {batch.id} did not complete (status: {batch.status})")
+
+        # Parse results; output lines are not guaranteed to be in input order.
+        # An expired batch may still have output for the requests that ran.
+        if batch.output_file_id:
+            output = self.client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+
+                result = json.loads(line)
+                custom_id = result["custom_id"]
+                response = result.get("response")
+                if result.get("error") or not response or response["status_code"] != 200:
+                    print(f"  ⚠ Batch request {custom_id} failed: {result.get('error')}")
+                    continue
+
+                i = int(custom_id.removeprefix("chunk-"))
+                choice = response["body"]["choices"][0]
+                translation = choice["message"].get("content")
+                try:
+                    if self._is_complete(translation, choice.get("finish_reason"), f"Batch request {custom_id}"):
+                        self._cache_put(keys[i - 1], translation)
+                except Exception as e:
+                    print(f"  ⚠ {str(e)}")
+                    continue
+
+                translations[i - 1] = translation
+
+        # Whatever the batch couldn't translate is sent as regular requests
+        failed = [i for i in missing if translations[i - 1] is None]
+        if failed:
+            print(f"  ⚠ {len(failed)} chunk(s) missing from batch {batch.id}, translating them directly")
+            retried = self._iter_async(
+                self._translate_stream([chunks[i - 1] for i in failed], target_language, len(failed)))
+            for i, translation in zip(failed, list(retried)):
+                translations[i - 1] = translation
+
+        return translations
+
+    def _run(self, coro):
+        """Run a coroutine on the background event loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            # Don't leave work running on the shared loop if the caller is interrupted
+            future.cancel()
+            raise
+
+    def _iter_async(self, agen):
+        """Drive an async generator on the background loop from synchronous code.
+
+        In-flight tasks keep running on the loop while the caller handles
+        each item.
+        """
+        done = object()
+        try:
+            while True:
+                item = self._run(_anext(agen, done))
+                if item is done:
+                    return
+                yield item
+        finally:
+            self._run(agen.aclose())
+
+    async def _translate_as_completed(self, chunks, target_language):
+        """Translate chunks concurrently, yielding (i, total, translation) as each finishes."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def translate_numbered(i, chunk):
+            return i, await self._translate_one(semaphore, chunk, i, len(chunks), target_language)
+
+        tasks = [asyncio.create_task(translate_numbered(i, chunk))
+                 for i, chunk in enumerate(chunks, 1)]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                i, translated_chunk = await next_done
+                yield i, len(chunks), translated_chunk
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _translate_stream(self, chunks, target_language, total=None):
+        """Translate chunks as they are produced, yielding results in order.
+
+        The chunk iterator (which may still be extracting pages) runs in a
+        worker thread, so translation requests overlap with parsing. At
+        most twice max_concurrency translations are held at once. total is
+        only used for progress output and may be None when it isn't known.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        chunks = iter(chunks)
+        pending = deque()
+
+        try:
+            i = 0
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+
+                i += 1
+                pending.append(asyncio.create_task(
+                    self._translate_one(semaphore, chunk, i, total, target_language)))
+
+                # Hand finished chunks on in order as soon as they're ready
+                while pending and (pending[0].done() or len(pending) >= 2 * self.max_concurrency):
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _translate_one(self, semaphore, chunk, i, total, target_language):
+        """Translate a single chunk once a concurrency slot is free."""
+        progress = f"{i}/{total}" if total else f"{i}"
+
+        key = self._cache_key(chunk, target_language)
+        cached = self._cache_get(key)
+        if cached is not None:
+            print(f"  ➤ Chunk {progress} found in cache")
+            return cached
+
+        async with semaphore:
+            print(f"  ➤ Translating chunk {progress}")
+            messages = self._build_messages(chunk, target_language)
+            response = await self._create_completion(messages)
+
+        choice = response.choices[0]
+        translated_text = choice.message.content
+        if self._is_complete(translated_text, choice.finish_reason, f"Chunk {progress}"):
+            self._cache_put(key, translated_text)
+
+        # Debug: Show preview of what was translated
+        print(f"      Preview: {translated_text[:50]}...")
 
-    def create_pdf(self, text, output_path):
-        """Create a PDF file with the translated text."""
-        print(f"📄 Creating PDF: {output_path}")
+        return translated_text
 
+    @retry(retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+           wait=wait_exponential(multiplier=1, min=1, max=30),
+           stop=stop_after_attempt(5),
+           reraise=True)
+    async def _create_completion(self, messages):
+        """Call the chat completions API, backing off on rate limits, connection and server errors."""
+        return await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature
+        )
+
+    def _is_complete(self, translation, finish_reason, label):
+        """Check a model reply; return whether it is complete enough to cache.
+
+        Empty replies raise. Replies cut short (by the token limit or a
+        content filter) are still used but not cached, so they are retried
+        on the next run.
+        """
+        if not isinstance(translation, str) or not translation.strip():
+            raise Exception(f"{label} returned no translation (finish reason: {finish_reason})")
+
+        if finish_reason != "stop":
+            print(f"  ⚠ {label} may be incomplete (finish reason: {finish_reason}), not caching it")
+            return False
+
+        return True
+
+    def _cache_key(self, chunk, target_language):
+        """Return the cache key for a chunk translation."""
+        return hashlib.sha256(f"{self.model}|{target_language}|{chunk}".encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key):
+        """Look up a cached translation in memory, then on disk."""
+        with self._cache_lock:
+            translation = self._memory_cache.get(key)
+            if translation is not None:
+                self._memory_cache.move_to_end(key)
+                return translation
+
+        path = self._cache_dir / key[:2] / key
+        try:
+            translation = path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+        self._remember(key, translation)
+        return translation
+
+    def _cache_put(self, key, translation):
+        """Store a translation in memory and on disk."""
+        self._remember(key, translation)
+
+        path = self._cache_dir / key[:2] / key
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Write to a temp file and rename so readers never see a partial entry
+            with tempfile.NamedTemporaryFile('w', dir=path.parent, encoding='utf-8', delete=False) as f:
+                f.write(translation)
+            os.replace(f.name, path)
+        except OSError as e:
+            print(f"  ⚠ Could not write translation cache: {str(e)}")
+
+    def _remember(self, key, translation):
+        """Add a translation to the in-memory LRU cache."""
+        with self._cache_lock:
+            self._memory_cache[key] = translation
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+
+    def create_pdf(self, text, output_path=None):
+        """Create a PDF file with the translated text.
+
+        If output_path is None, the PDF is returned as bytes instead of
+        being written to disk.
+        """
+        print(f"📄 Creating PDF: {output_path or '(in memory)'}")
+
+        pdf = self._new_pdf()
+        lines_added = self._write_paragraphs(pdf, text)
+
+        return self._output_pdf(pdf, output_path, lines_added)
+
+    def _new_pdf(self):
+        """Create an empty PDF document with the page and font settings."""
         pdf = FPDF()
         pdf.add_page()
         pdf.set_auto_page_break(auto=True, margin=15)
         pdf.set_font("Helvetica", size=11)
-
-        paragraphs = text.split('\n\n')
-
-        lines_added = 0
-        lines_skipped = 0
-
-        for para in paragraphs:
-            if not para.strip():
-                continue
-
-            try:
-                # Clean problematic characters using Unicode escapes
-                clean_para = (para
-                              .replace('\u2018', "'")  # '
-                              .replace('\u2019', "'")  # '
-                              .replace('\u201c', '"')  # "
-                              .replace('\u201d', '"')  # "
-                              .replace('\u2014', '-')  # —
-                              .replace('\u2026', '...'))  # …
-
-                # Add paragraph
-                pdf.multi_cell(0, 6, text=clean_para)
-                pdf.ln(4)
-                lines_added += 1
-
-            except Exception as e:
-                lines_skipped += 1
-                print(f"  ⚠ Skipped paragraph: {str(e)}")
-                continue
-
-        pdf.output(output_path)
+        return pdf
+
+    def _write_paragraphs(self, pdf, text):
+        """Add the paragraphs of text to the PDF; return the number added."""
+        # Clean problematic characters in a single pass, then replace anything
+        # the built-in Helvetica font can't encode so multi_cell never raises
+        clean_text = text.translate(_CLEAN_TABLE).encode('latin-1', 'replace').decode('latin-1')
+
+        paragraphs = [para for para in clean_text.split('\n\n') if para.strip()]
+        if not paragraphs:
+            return 0
+
+        # One multi_cell call lays out every paragraph; the blank line between
+        # them gives the paragraph spacing
+        pdf.multi_cell(0, 6, text='\n\n'.join(paragraphs))
+        pdf.ln(6)
+
+        return len(paragraphs)
+
+    def _output_pdf(self, pdf, output_path, lines_added):
+        """Write the PDF to output_path, or return its bytes if no path is given."""
+        pdf_bytes = None
+        if output_path:
+            pdf.output(output_path)
+        else:
+            # fpdf2 returns the document as a bytearray when no name is given
+            pdf_bytes = bytes(pdf.output())
 
         print(f"✓ PDF created successfully!")
         print(f"  ➤ Paragraphs added: {lines_added}")
-        if lines_skipped > 0:
-            print(f"  ⚠ Paragraphs skipped: {lines_skipped}")
 
-    def translate_pdf(self, input_path, output_path, target_language):
-        """Main function: translate a complete PDF file."""
+        return pdf_bytes
+
+    def translate_pdf(self, input_path, output_path, target_language, batch=False):
+        """Main function: translate a complete PDF file.
+
+        Pages are extracted, translated and written as a pipeline, so each
+        stage works on the next chunk while the others finish the previous
+        one. Batch mode needs every chunk up front and runs the stages in turn.
+        """
         print("=" * 60)
         print("PDF TRANSLATION STARTING")
         print("=" * 60)
 
-        # Step 1: Extract text
-        text = self.extract_text(input_path)
-        print(f"\n✓ Extracted {len(text)} characters\n")
+        if batch:
+            # Step 1: Extract text
+            blocks = self.extract_blocks(input_path)
+            print(f"\n✓ Extracted {sum(len(block) for block in blocks)} characters\n")
 
-        # Check if we got any text
-        if not text:
-            raise ValueError("No text found in PDF!")
+            # Check if we got any text
+            if not blocks:
+                raise ValueError("No text found in PDF!")
 
-        # Step 2: Translate
-        translated_text = self.translate_text(text, target_language)
+            # Step 2: Translate
+            translated_text = self.translate_text(blocks, target_language, batch=True)
 
-        # Step 3: Create new PDF
-        print()  # Add blank line
-        self.create_pdf(translated_text, output_path)
+            # Step 3: Create new PDF
+            print()  # Add blank line
+            self.create_pdf(translated_text, output_path)
+        else:
+            translated_text = self._run(
+                self._translate_pdf_stream(input_path, output_path, target_language))
 
         print("\n" + "=" * 60)
         print("TRANSLATION COMPLETE!")
@@ -160,6 +727,32 @@ class PDFTranslator:
 
         return translated_text
 
+    async def _translate_pdf_stream(self, input_path, output_path, target_language):
+        """Extract, translate and write a PDF chunk by chunk."""
+        print(f"🌐 Translating to {target_language}...")
+
+        pdf = self._new_pdf()
+        translated_chunks = []
+        lines_added = 0
+
+        blocks = (block for _, page_blocks in self.iter_pages(input_path) for block in page_blocks)
+        chunks = self._pack_blocks(blocks)
+
+        # Each chunk is laid out as soon as it and every chunk before it are done
+        async for translated_chunk in self._translate_stream(chunks, target_language):
+            lines_added += self._write_paragraphs(pdf, translated_chunk)
+            translated_chunks.append(translated_chunk)
+
+        # Check if we got any text
+        if not translated_chunks:
+            raise ValueError("No text found in PDF!")
+
+        print("✓ Translation complete!\n")
+        print(f"📄 Creating PDF: {output_path}")
+        self._output_pdf(pdf, output_path, lines_added)
+
+        return '\n\n'.join(translated_chunks)
+
 
 # if __name__ == "__main__":
 #     translator = PDFTranslator()